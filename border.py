@@ -13,16 +13,92 @@ Used tkinter for GUI and PIL for image processing
 import os
 import tkinter as tk
 from tkinter import simpledialog, filedialog, messagebox, ttk
-from PIL import Image, ImageOps
-import json
+from PIL import Image, ImageFile
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
 from enum import Enum
+from functools import lru_cache, partial
+
+# orjson is an optional faster JSON library, the json module is used when it is missing
+try:
+    import orjson
+
+    def json_dumps(data):
+        return orjson.dumps(data)
+
+    def json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def json_dumps(data):
+        return json.dumps(data).encode()
+
+    def json_loads(data):
+        return json.loads(data)
+
+# pic-scale is an optional SIMD resampler, Pillow's resize is used when it is missing
+try:
+    from pic_scale import Plan, Resampling
+except ImportError:
+    Plan = None
+
+# pyvips is an optional streaming backend for the formats it can write, Pillow is used when it is missing
+try:
+    import pyvips
+
+    # Every image is read once, and a cached result would hide changes to a file with the same name
+    pyvips.cache_set_max(0)
+
+    # The images are already processed in parallel by the worker processes, one thread each is enough
+    pyvips.concurrency_set(1)
+
+    # Save option dropping every metadata block, named keep since libvips 8.15
+    pyvips_strip_options = {'keep': 'none'} if pyvips.at_least_libvips(8, 15) else {'strip': True}
+except (ImportError, OSError):
+    pyvips = None
+
+# PyTurboJPEG is an optional faster JPEG encoder, Pillow saves JPEG images when it or libjpeg-turbo is missing
+try:
+    import numpy
+    from turbojpeg import TurboJPEG, TJFLAG_PROGRESSIVE, TJPF_GRAY, TJPF_RGB, TJSAMP_420, TJSAMP_GRAY
+
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    turbo_jpeg = None
 
 """
 JSON that contains the last configuration used when editing an image
 """
 last_json_data = "last_config"
 
+"""
+Quality used when saving JPEG images, visually the same as 100 for a fraction of the size
+"""
+jpeg_quality = 90
+
+"""
+Buffer size used when saving images. Pillow writes the pixel data of BMP and TIFF images straight
+to the file in blocks of ImageFile.MAXBLOCK bytes (64 KiB by default), so a 1080x1350 BMP takes
+6 writes instead of 69. The buffer of the output file only groups the smaller writes, like the
+chunks of a PNG
+"""
+output_buffer_size = 1 << 20
+ImageFile.MAXBLOCK = output_buffer_size
+
+"""
+Formats Pillow reports for JPEG files. Many camera and phone photos are read as MPO,
+which are saved as plain JPEG
+"""
+jpeg_formats = ('JPEG', 'MPO')
+
+"""
+Formats saved without compression, whose pixel data size is known before saving
+"""
+uncompressed_formats = ('BMP', 'TIFF')
+
 """
 Enum class containing the items that can be saved
 on json files and that will be used for editing the image
@@ -32,6 +108,40 @@ class Entries(Enum):
     HEIGHT_ENTRY = "output_height"
     BORDER_SIZE_HEIGHT_ENTRY = "height_border_size"
     POSTFIX_ENTRY = "postfix"
+    FORCE_LANCZOS_ENTRY = "force_lanczos"
+
+
+"""
+Pairs of entry and key on the json files, computed once
+"""
+entry_keys = [(entry, entry.value) for entry in Entries]
+
+"""
+Configuration used for editing the images, parsed once from the entries.
+The field names are the same as the values of Entries, so it can be saved as it is
+"""
+@dataclass(frozen=True, slots=True)
+class Configuration:
+    output_width: int
+    output_height: int
+    height_border_size: int
+    postfix: str
+    force_lanczos: bool = False
+
+    """
+    Method for parsing and validating the values of the entries
+    """
+    @classmethod
+    def from_entries(cls, entries):
+        postfix = entries[Entries.POSTFIX_ENTRY].get()
+        configuration = cls(int(entries[Entries.WIDTH_ENTRY].get()), int(entries[Entries.HEIGHT_ENTRY].get()),
+                            int(entries[Entries.BORDER_SIZE_HEIGHT_ENTRY].get()), postfix,
+                            bool(entries[Entries.FORCE_LANCZOS_ENTRY].get()))
+
+        if not postfix:
+            raise TypeError("Add a postfix to avoid modifying the original photo.")
+
+        return configuration
 
 
 """
@@ -40,84 +150,283 @@ of the original image
 """
 class Orientation(Enum):
     NORMAL = 1
-    CLOCKWISE_90 = 8
+    MIRRORED_HORIZONTAL = 2
     CLOCKWISE_180 = 3
+    MIRRORED_VERTICAL = 4
+    TRANSPOSED = 5
     CLOCKWISE_270 = 6
+    TRANSVERSED = 7
+    CLOCKWISE_90 = 8
+
+"""
+Transposition that puts the image upright for each orientation. Transpositions are
+plain pixel copies, so they are cheaper than a rotation and lose no quality
+"""
+orientation_transpositions = {
+    Orientation.MIRRORED_HORIZONTAL.value: Image.Transpose.FLIP_LEFT_RIGHT,
+    Orientation.CLOCKWISE_180.value: Image.Transpose.ROTATE_180,
+    Orientation.MIRRORED_VERTICAL.value: Image.Transpose.FLIP_TOP_BOTTOM,
+    Orientation.TRANSPOSED.value: Image.Transpose.TRANSPOSE,
+    Orientation.CLOCKWISE_270.value: Image.Transpose.ROTATE_270,
+    Orientation.TRANSVERSED.value: Image.Transpose.TRANSVERSE,
+    Orientation.CLOCKWISE_90.value: Image.Transpose.ROTATE_90
+}
+
+"""
+Transpositions that swap the width and the height of the image
+"""
+swapping_transpositions = (Image.Transpose.TRANSPOSE, Image.Transpose.ROTATE_270, Image.Transpose.TRANSVERSE,
+                           Image.Transpose.ROTATE_90)
+
+"""
+Image modes pic-scale can resample, any other mode goes through Pillow
+"""
+pic_scale_modes = ("L", "LA", "RGB", "RGBA", "I;16", "F")
+
+"""
+Largest scale factor resized with the bicubic algorithm, lanczos is only worth
+its wider filter for bigger scale factors
+"""
+bicubic_max_scale = 2
+
+"""
+Number of resize plans each worker keeps. A used plan takes close to 1 MB and most photos
+don't share their exact size, so only the most recent geometries are kept
+"""
+resize_plans_max = 8
+
+"""
+Method for retrieving the resize plan of a geometry, building it only when it isn't one of
+the latest used. The filter weights of a plan are computed once and reused for every image
+with the same source size, target size, mode and algorithm
+"""
+@lru_cache(maxsize=resize_plans_max)
+def get_resize_plan(source_size, size, mode, use_lanczos):
+    return Plan(source_size, size, Resampling.LANCZOS if use_lanczos else Resampling.BICUBIC, mode)
+
+"""
+Method for resizing an image, using pic-scale when available. The lanczos algorithm is used
+for big scale factors or when it is forced, the bicubic one for the rest
+"""
+def resize_image(img, size, force_lanczos=False):
+    # Images already at the target size are used as they are
+    if img.size == size:
+        return img
+
+    scale = max(img.width / size[0], img.height / size[1], size[0] / img.width, size[1] / img.height)
+    use_lanczos = force_lanczos or scale > bicubic_max_scale
+
+    if Plan is None or img.mode not in pic_scale_modes:
+        return img.resize(size, Image.LANCZOS if use_lanczos else Image.BICUBIC)
+
+    return get_resize_plan(img.size, size, img.mode, use_lanczos).resize(img)
+
+"""
+Method for encoding an RGB or grayscale image as JPEG with libjpeg-turbo, with the same
+options used when saving with Pillow
+"""
+def encode_jpeg(img, dpi):
+    if img.mode == 'L':
+        data = turbo_jpeg.encode(numpy.asarray(img)[..., None], quality=jpeg_quality, pixel_format=TJPF_GRAY,
+                                 jpeg_subsample=TJSAMP_GRAY, flags=TJFLAG_PROGRESSIVE)
+    else:
+        data = turbo_jpeg.encode(numpy.asarray(img), quality=jpeg_quality, pixel_format=TJPF_RGB,
+                                 jpeg_subsample=TJSAMP_420, flags=TJFLAG_PROGRESSIVE)
+
+    # libjpeg-turbo leaves the density of the JFIF header at 1:1
+    if dpi:
+        data = set_jfif_density(data, dpi)
+
+    return data
+
+"""
+Method for writing the dpi in the JFIF header of JPEG data, adding the header when it is missing
+"""
+def set_jfif_density(data, dpi):
+    density = bytes([1]) + int(round(dpi[0])).to_bytes(2, 'big') + int(round(dpi[1])).to_bytes(2, 'big')
+    if data[6:11] == b'JFIF\x00':
+        return data[:13] + density + data[18:]
+    return data[:2] + b'\xff\xe0\x00\x10JFIF\x00\x01\x01' + density + b'\x00\x00' + data[2:]
+
+"""
+Method for calculating the size of the resized image and its left and top borders.
+Every size is an integer and the two borders of each axis always add up to the
+requested output size, so a single resize is enough
+"""
+def calculate_geometry(original_width, original_height, configuration):
+    output_width, output_height = configuration.output_width, configuration.output_height
+    longest_side_border_size = configuration.height_border_size
+
+    # Resizing of image depending on which original size is bigger
+    if original_height > original_width:
+        resize_height = output_height - (longest_side_border_size * 2)
+        resize_width = int(round((resize_height * original_width) / original_height))
+    else:
+        resize_width = output_width - (longest_side_border_size * 2)
+        resize_height = int(round((resize_width * original_height) / original_width))
+    border_left = (output_width - resize_width) // 2
+    border_top = (output_height - resize_height) // 2
+
+    return resize_width, resize_height, border_left, border_top
+
+"""
+Method for getting the size an image will have once transposed
+"""
+def get_transposed_size(size, transposition):
+    if transposition in swapping_transpositions:
+        return size[1], size[0]
+    return size
+
+"""
+Method for checking if the image would be cropped, which happens when a calculated border is lower than zero
+"""
+def would_crop(original_width, original_height, configuration):
+    _, _, border_left, border_top = calculate_geometry(original_width, original_height, configuration)
+    return min(border_left, border_top) < 0
+
+"""
+Method for getting the transposition that puts an opened image upright, based on its exif data.
+Pillow already applies the orientation of TIFF images itself, reporting the upright size on
+open and transposing the pixels on load, so those don't need any
+"""
+def get_transposition(img):
+    if img.format == 'TIFF':
+        return None
+    return orientation_transpositions.get(img.getexif().get(0x0112))  # EXIF tag for orientation
+
+"""
+Method for reading the size of an image, as it will be once rotated, from its header only
+"""
+def get_oriented_size(input_image_path):
+    with Image.open(input_image_path) as img:
+        return get_transposed_size(img.size, get_transposition(img))
+
+"""
+Extensions of the images processed with pyvips, when it is installed
+"""
+pyvips_extensions = ('.jpg', '.jpeg', '.png', '.tif', '.tiff')
+
+"""
+Method for adding the white border to the image with pyvips. The image is shrunk while it is
+loaded and then streamed through the pipeline, so it is never held in memory at full size
+"""
+def add_white_border_pyvips(input_image_path, new_output_image_path, configuration):
+    original_width, original_height = get_oriented_size(input_image_path)
+    resize_width, resize_height, border_left, border_top = calculate_geometry(original_width, original_height,
+                                                                              configuration)
+
+    # Thumbnail rotates the image using its exif data and resizes it with the lanczos algorithm.
+    # Unlike Pillow, it also converts CMYK images to sRGB, so CMYK JPEGs are saved as RGB
+    resized_img = pyvips.Image.thumbnail(input_image_path, resize_width, height=resize_height, size='force')
+    bordered_img = resized_img.embed(border_left, border_top, configuration.output_width,
+                                     configuration.output_height, extend='white')
+
+    # Saving the final image without the exif, xmp and iptc data of the original, as Pillow does.
+    # Stripped JPEGs have no JFIF header either, so the dpi is written back into a new one
+    ext = os.path.splitext(new_output_image_path)[1].lower()
+    if ext in ('.jpg', '.jpeg'):
+        data = bordered_img.write_to_buffer('.jpg', Q=jpeg_quality, optimize_coding=True, interlace=True,
+                                            subsample_mode='on', **pyvips_strip_options)
+        if bordered_img.get_typeof('resolution-unit'):
+            data = set_jfif_density(data, (bordered_img.xres * 25.4, bordered_img.yres * 25.4))
+        with open(new_output_image_path, 'wb') as output_file:
+            output_file.write(data)
+    elif ext == '.png':
+        bordered_img.write_to_file(new_output_image_path, compression=6, **pyvips_strip_options)
+    else:
+        bordered_img.write_to_file(new_output_image_path, **pyvips_strip_options)
+
+    return True
 
 """
 Method for adding the white border to the image
 
-Improvements
-    finding divisors or closest divisor to avoid having to resize the image twice for precision
-"""
-def add_white_border(input_image_path, output_image_path, output_width, output_height, longest_side_border_size,
-                     postfix):
-    return_value = True
-    with Image.open(input_image_path).copy() as img_copy:
-
-        # Using exif data to properly rotate the image
-        exif_data = img_copy.getexif()
-        if exif_data:
-            orientation = exif_data.get(0x0112)  # EXIF tag for orientation
-
-            if orientation is Orientation.CLOCKWISE_90.value:
-                img_copy = img_copy.rotate(90, expand=True)
-            elif orientation is Orientation.CLOCKWISE_180.value:
-                img_copy = img_copy.rotate(180, expand=True)
-            elif orientation is Orientation.CLOCKWISE_270.value:
-                img_copy = img_copy.rotate(270, expand=True)
-
-        # Getting size of the original image
-        original_width, original_height = img_copy.size
-
-        # Getting the output path
-        base, ext = os.path.splitext(output_image_path)
-        new_output_image_path = f"{base}{postfix}{ext}"
-
-        # Resizing of image depending on which original size is bigger
-        if original_height > original_width:
-            resize_height = output_height - (longest_side_border_size * 2)
-            resize_width = (resize_height * original_width) / original_height
-            calculated_border_size = (output_width - resize_width) / 2
-        else:
-            resize_width = output_width - (longest_side_border_size * 2)
-            resize_height = (resize_width * original_height) / original_width
-            calculated_border_size = (output_height - resize_height) / 2
-
-        # If calculated border is lower than zero, that means the image might be cropped
-        if calculated_border_size < 0:
-            result = messagebox.askquestion("Proceed?",
-                                            f"The current configuration will crop the image {base}. Do you want to "
-                                            f"proceed?")
-            if result == 'no':
-                return_value = False
-                return
-
-        # Resizing the image using the lanczos algorithm
-        resized_img = img_copy.resize((int(resize_width), int(resize_height)), Image.LANCZOS)
-
-        # Expanding the image with the white border
-        if original_height > original_width:
-            bordered_img = ImageOps.expand(resized_img, border=(int(calculated_border_size), longest_side_border_size),
-                                           fill='white')
+It runs on the worker processes, so it must not touch the GUI
+"""
+def add_white_border(input_image_path, output_image_path, configuration):
+    output_width, output_height = configuration.output_width, configuration.output_height
+
+    # Getting the output path
+    base, ext = os.path.splitext(output_image_path)
+    new_output_image_path = f"{base}{configuration.postfix}{ext}"
+
+    if pyvips is not None and ext.lower() in pyvips_extensions:
+        return add_white_border_pyvips(input_image_path, new_output_image_path, configuration)
+
+    with Image.open(input_image_path) as img_source:
+
+        # Using exif data to know how the image has to be transposed
+        transposition = get_transposition(img_source)
+
+        # Getting size of the original image, as it will be once transposed
+        original_width, original_height = get_transposed_size(img_source.size, transposition)
+        resize_width, resize_height, border_left, border_top = calculate_geometry(original_width, original_height,
+                                                                                  configuration)
+
+        # JPEG images can be decoded at 1/2, 1/4 or 1/8 of their size almost for free. Asking
+        # for twice the resized size still leaves the lanczos algorithm enough pixels to average
+        if img_source.format in jpeg_formats:
+            img_source.draft('RGB', get_transposed_size((resize_width * 2, resize_height * 2), transposition))
+
+            # The draft changes the size of the image, so the geometry is calculated again
+            original_width, original_height = get_transposed_size(img_source.size, transposition)
+            resize_width, resize_height, border_left, border_top = calculate_geometry(original_width,
+                                                                                      original_height, configuration)
+
+        # Palette images are resized in RGB, as lanczos can't blend palette indexes and
+        # the white canvas wouldn't share their palette
+        img_pixels = img_source
+        if img_pixels.mode in ('1', 'P'):
+            img_pixels = img_pixels.convert('RGBA' if 'transparency' in img_pixels.info else 'RGB')
+
+        # Resizing the image. The transposition is done afterwards, so it only
+        # has to move the pixels of the smaller image
+        if transposition in swapping_transpositions:
+            resized_img = resize_image(img_pixels, (resize_height, resize_width), configuration.force_lanczos)
         else:
-            bordered_img = ImageOps.expand(resized_img, border=(longest_side_border_size, int(calculated_border_size)),
-                                           fill='white')
+            resized_img = resize_image(img_pixels, (resize_width, resize_height), configuration.force_lanczos)
+        if transposition is not None:
+            resized_img = resized_img.transpose(transposition)
 
-        # This resizing (improvement needed to remove it) is done, because the previous calculations
-        # might throw decimals and make the final result a pixel or two imprecise
-        bordered_img = bordered_img.resize((output_width, output_height), Image.LANCZOS)
+        # Pasting the image on a white canvas of the final size. ImageOps.expand only
+        # takes equal borders, so the odd pixel would otherwise need a second resize
+        bordered_img = Image.new(resized_img.mode, (output_width, output_height), 'white')
+        bordered_img.paste(resized_img, (border_left, border_top))
 
         # Saving the final image
-        bordered_img.save(new_output_image_path, format=img_copy.format, quality=100, dpi=img_copy.info.get("dpi"))
-
-    del img_copy
-    return return_value
+        output_format = 'JPEG' if img_source.format in jpeg_formats else img_source.format
+        save_options = {"dpi": img_source.info.get("dpi")}
+        if output_format == 'JPEG':
+            save_options.update(quality=jpeg_quality, optimize=True, progressive=True, subsampling="4:2:0")
+        elif output_format == 'PNG':
+            save_options.update(compress_level=6)
+        with open(new_output_image_path, 'wb', buffering=output_buffer_size) as output_file:
+            # Uncompressed formats take at least the size of their pixel data on disk, reserving
+            # it up front avoids growing the file on every write
+            if output_format in uncompressed_formats:
+                try:
+                    os.posix_fallocate(output_file.fileno(), 0,
+                                       output_width * output_height * len(bordered_img.getbands()))
+                except (AttributeError, OSError):
+                    pass
+
+            if output_format == 'JPEG' and turbo_jpeg is not None and bordered_img.mode in ('RGB', 'L'):
+                output_file.write(encode_jpeg(bordered_img, img_source.info.get("dpi")))
+            else:
+                bordered_img.save(output_file, format=output_format,
+                                  **{key: value for key, value in save_options.items() if value is not None})
+
+            # The reserved size leaves out the headers and the row padding, so it is always
+            # smaller than the saved file and this never removes anything. It only keeps the
+            # file size right if the reserved size is ever estimated too high
+            output_file.truncate()
+
+    return True
 
 """
 Method for saving configurations
 """
-def save_configuration(entries, source=None):
+def save_configuration(configuration, source=None):
     config_name = None
 
     if source == "button":
@@ -128,16 +437,11 @@ def save_configuration(entries, source=None):
     if config_name:
         config_filename = f"{config_name}.json"
 
-        config_data = {
-            Entries.WIDTH_ENTRY.value: entries[Entries.WIDTH_ENTRY].get(),
-            Entries.HEIGHT_ENTRY.value: entries[Entries.HEIGHT_ENTRY].get(),
-            Entries.BORDER_SIZE_HEIGHT_ENTRY.value: entries[Entries.BORDER_SIZE_HEIGHT_ENTRY].get(),
-            Entries.POSTFIX_ENTRY.value: entries[Entries.POSTFIX_ENTRY].get()
-        }
+        config_data = asdict(configuration)
 
         try:
-            with open(config_filename, "w") as f:
-                json.dump(config_data, f)
+            with open(config_filename, "wb") as f:
+                f.write(json_dumps(config_data))
             load_combo['values'] = get_all_config_files()
 
         except Exception as e:
@@ -145,11 +449,33 @@ def save_configuration(entries, source=None):
     else:
         messagebox.showwarning("Invalid Name", "Please enter a valid name for the configuration.")
 
+"""
+Method for reading the configuration from the entries, showing what is wrong when it isn't valid
+"""
+def read_configuration(entries):
+    try:
+        return Configuration.from_entries(entries)
+    except ValueError:
+        messagebox.showerror("Invalid Input", "Please enter valid values.")
+    except TypeError as e:
+        messagebox.showerror("Invalid Input", f"{e}")
+
+"""
+Method called by the save button, the configuration is only saved when it is valid
+"""
+def save_entries(entries):
+    configuration = read_configuration(entries)
+    if configuration:
+        save_configuration(configuration, source="button")
+
 """
 Small method for retrieving config files 
 """
 def get_all_config_files():
-    return [os.path.splitext(f)[0] for f in os.listdir() if f.endswith('.json') and f != f"{last_json_data}.json"]
+    skipped_file = f"{last_json_data}.json"
+    with os.scandir() as directory_entries:
+        return [entry.name[:-5] for entry in directory_entries
+                if entry.name.endswith('.json') and entry.name != skipped_file and entry.is_file()]
 
 """
 Method for loading configurations
@@ -164,41 +490,47 @@ def load_selected_configuration(event):
 
     if selected_file:
         try:
-            with open(selected_file, "r") as f:
-                config = json.load(f)
+            with open(selected_file, "rb") as f:
+                config = json_loads(f.read())
                 print(config)
-                width_entry.delete(0, tk.END)
-                width_entry.insert(0, config.get(Entries.WIDTH_ENTRY.value, ""))
-                height_entry.delete(0, tk.END)
-                height_entry.insert(0, config.get(Entries.HEIGHT_ENTRY.value, ""))
-                border_size_height_entry.delete(0, tk.END)
-                border_size_height_entry.insert(0, config.get(Entries.BORDER_SIZE_HEIGHT_ENTRY.value, ""))
-                postfix_entry.delete(0, tk.END)
-                postfix_entry.insert(0, config.get(Entries.POSTFIX_ENTRY.value, ""))
+                for entry, key in entry_keys:
+                    if entry is Entries.FORCE_LANCZOS_ENTRY:
+                        all_entries[entry].set(config.get(key, False))
+                    else:
+                        all_entries[entry].delete(0, tk.END)
+                        all_entries[entry].insert(0, config.get(key, ""))
         except FileNotFoundError:
             pass
 
+"""
+Pool of worker processes processing the images. It is kept for the whole session, so the
+resize plans each worker builds are reused by every later image with the same geometry
+"""
+executor = None
+
+"""
+Method for retrieving the pool of worker processes, creating it on the first batch.
+It has the default one worker per core, which Windows caps at 61 processes.
+Each worker registers the Pillow codecs once, before its first image
+"""
+def get_executor():
+    global executor
+
+    if executor is None:
+        executor = ProcessPoolExecutor(initializer=Image.init)
+    return executor
+
 """
 Main method that does the image processing and calls the rest of the methods 
 """
 def process_images(entries, event=None):
-    try:
-        output_width = int(entries[Entries.WIDTH_ENTRY].get())
-        output_height = int(entries[Entries.HEIGHT_ENTRY].get())
-        height_border_size = int(entries[Entries.BORDER_SIZE_HEIGHT_ENTRY].get())
-        postfix = entries[Entries.POSTFIX_ENTRY].get()
-
-        if not postfix:
-            raise TypeError("Add a postfix to avoid modifying the original photo.")
+    global executor
 
-    except ValueError:
-        messagebox.showerror("Invalid Input", "Please enter valid values.")
-        return
-    except TypeError as e:
-        messagebox.showerror("Invalid Input", f"{e}")
+    configuration = read_configuration(entries)
+    if not configuration:
         return
 
-    save_configuration(entries)
+    save_configuration(configuration)
 
     input_file_paths = filedialog.askopenfilenames(title="Select Input Images",
                                                    filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.tiff;*.bmp;*.gif")])
@@ -211,10 +543,39 @@ def process_images(entries, event=None):
     if not os.path.exists(output_directory):
         os.makedirs(output_directory)
 
+    # Checking on the GUI process which images would be cropped, as the workers can't ask.
+    # Image.open only reads the header, so no pixel data is decoded here
+    accepted_file_paths = []
+    cropped_file_names = []
     for input_image_path in input_file_paths:
-        filename = os.path.basename(input_image_path)
-        output_image_path = os.path.join(output_directory, filename)
-        add_white_border(input_image_path, output_image_path, output_width, output_height, height_border_size, postfix)
+        original_width, original_height = get_oriented_size(input_image_path)
+        if would_crop(original_width, original_height, configuration):
+            cropped_file_names.append(os.path.splitext(os.path.basename(input_image_path))[0])
+        else:
+            accepted_file_paths.append(input_image_path)
+
+    if cropped_file_names:
+        result = messagebox.askquestion("Proceed?",
+                                        f"The current configuration will crop the images "
+                                        f"{', '.join(cropped_file_names)}. Do you want to proceed with them?")
+        if result == 'yes':
+            accepted_file_paths = list(input_file_paths)
+
+    # Every image is independent from the others, so they are processed in parallel
+    try:
+        futures = [get_executor().submit(add_white_border, input_image_path,
+                                         os.path.join(output_directory, os.path.basename(input_image_path)),
+                                         configuration)
+                   for input_image_path in accepted_file_paths]
+        for future in as_completed(futures):
+            future.result()
+    except BrokenProcessPool:
+        # A worker died, so the pool can't be used anymore. The next batch creates a new one
+        executor.shutdown(wait=False)
+        executor = None
+        messagebox.showerror("Error", "A worker process stopped while processing the images. "
+                                      "Please try again.")
+        return
 
     messagebox.showinfo("Process Complete", f"Process Complete")
     output_directory = output_directory.replace("/", "\\")
@@ -225,6 +586,9 @@ This needs some improvements for the global variables
 But it's the code creating the GUI and gluing all together
 """
 if __name__ == '__main__':
+    # Registering every Pillow codec now, instead of on the first image of each format
+    Image.init()
+
     # Create the main application window
     root = tk.Tk()
     root.title("Image Border and Resize Tool")
@@ -246,30 +610,39 @@ if __name__ == '__main__':
     postfix_entry = tk.Entry(root)
     postfix_entry.grid(row=3, column=1, padx=10, pady=10)
 
-    load_selected_configuration(event=None)
+    force_lanczos_var = tk.BooleanVar(root)
+    tk.Checkbutton(root, text="Force Lanczos (slower, for small scale changes)",
+                   variable=force_lanczos_var).grid(row=4, column=0, columnspan=2, padx=10, pady=0)
 
     # Entries
     all_entries = {
         Entries.WIDTH_ENTRY: width_entry,
         Entries.HEIGHT_ENTRY: height_entry,
         Entries.BORDER_SIZE_HEIGHT_ENTRY: border_size_height_entry,
-        Entries.POSTFIX_ENTRY: postfix_entry
+        Entries.POSTFIX_ENTRY: postfix_entry,
+        Entries.FORCE_LANCZOS_ENTRY: force_lanczos_var
     }
 
-    process_button = tk.Button(root, text="Process Images", command=lambda: process_images(all_entries))
-    process_button.grid(row=4, column=0, columnspan=2, pady=10)
+    load_selected_configuration(event=None)
+
+    process_button = tk.Button(root, text="Process Images", command=partial(process_images, all_entries))
+    process_button.grid(row=5, column=0, columnspan=2, pady=10)
 
-    save_button = tk.Button(root, text="Save", command=lambda: save_configuration(all_entries, source="button"))
-    save_button.grid(row=5, column=0, pady=0)
+    save_button = tk.Button(root, text="Save", command=partial(save_entries, all_entries))
+    save_button.grid(row=6, column=0, pady=0)
 
     # Create and place the dropdown for loading configurations
-    tk.Label(root, text="Load Configuration:").grid(row=5, column=1, padx=10, pady=0)
+    tk.Label(root, text="Load Configuration:").grid(row=6, column=1, padx=10, pady=0)
     load_combo = ttk.Combobox(root, width=30, values=get_all_config_files())
-    load_combo.grid(row=6, column=1, padx=10, pady=10)
+    load_combo.grid(row=7, column=1, padx=10, pady=10)
     load_combo.bind("<<ComboboxSelected>>", load_selected_configuration)
 
-    # Bind <Return> key to trigger process_images()
-    root.bind('<Return>', lambda event: process_images(all_entries))
+    # Bind <Return> key on the entries to trigger process_images()
+    for entry in (width_entry, height_entry, border_size_height_entry, postfix_entry):
+        entry.bind('<Return>', partial(process_images, all_entries))
 
     # Run the application
     root.mainloop()
+
+    if executor is not None:
+        executor.shutdown()